@@ -1,32 +1,77 @@
+from datetime import timedelta
+from functools import lru_cache
 from django_filters.rest_framework import FilterSet
 from django_filters import DateFilter, NumberFilter
+from django_filters.constants import EMPTY_VALUES
 
 
-class BaseDateRangeFilterSet(FilterSet):
+@lru_cache(maxsize=None)
+def _field_label(field):
+    """
+    Humanizes a field name ('created_at' -> 'Created At'), once per field name.
+    """
+    return ' '.join(word.capitalize() for word in field.split('_'))
+
+
+def _build_range_filters(fields, filter_class, label_formats, lte_method=None):
+    """
+    Builds the '<field>_gte' / '<field>_lte' filters for the given fields in one pass.
+    'label_formats' is a (gte, lte) pair of format strings receiving the humanized field name.
+    If 'lte_method' is given, the upper bound is delegated to that FilterSet method
+    instead of a plain 'lte' lookup.
+    """
+    gte_format, lte_format = label_formats
+    lte_kwargs = {'method': lte_method} if lte_method else {'lookup_expr': 'lte'}
+    filters = {}
+    for field in fields:
+        label = _field_label(field)
+        filters[f"{field}_gte"] = filter_class(field_name=field, lookup_expr='gte', label=gte_format.format(label))
+        filters[f"{field}_lte"] = filter_class(field_name=field, label=lte_format.format(label), **lte_kwargs)
+    return filters
+
+
+def _check_meta_model(cls):
+    if not hasattr(cls, 'Meta') or not hasattr(cls.Meta, 'model'):
+        raise TypeError(f"{cls.__name__} must define a Meta.model")
+
+
+class ShortCircuitFilterSet(FilterSet):
+    """
+    A FilterSet returning the queryset untouched when no filter value was supplied,
+    instead of running every declared filter as a no-op.
+    """
+    def filter_queryset(self, queryset):
+        if all(value in EMPTY_VALUES for value in self.form.cleaned_data.values()):
+            return queryset
+        return super().filter_queryset(queryset)
+
+
+class BaseDateRangeFilterSet(ShortCircuitFilterSet):
     """
     A reusable base class for date range filtering on a given list or tuple of date fields.
     The iterable is to be delared as 'date_fields'.
+    Ranges are half-open on the underlying datetime columns ('>= start' and '< end + 1 day'),
+    so that the whole end day is included and the column index can still be range-scanned.
     """
     date_fields = []
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        if not hasattr(cls, 'Meta') or not hasattr(cls.Meta, 'model'):
-            raise TypeError(f"{cls.__name__} must define a Meta.model")
-        for field in getattr(cls, 'date_fields', []):
-            cls.base_filters[f"{field}_gte"] = DateFilter(
-                field_name=field,
-                lookup_expr='gte',
-                label=f"{field.replace('_', ' ').title()} From"
-            )
-            cls.base_filters[f"{field}_lte"] = DateFilter(
-                field_name=field,
-                lookup_expr='lte',
-                label=f"{field.replace('_', ' ').title()} To"
-            )
+        _check_meta_model(cls)
+        # 'declared_filters' is the subclass' own dict at this point: FilterSetMetaclass
+        # builds 'base_filters' from it right after class creation.
+        cls.declared_filters.update(
+            _build_range_filters(cls.date_fields, DateFilter, ('{} From', '{} To'), lte_method='filter_date_lte')
+        )
 
+    def filter_date_lte(self, queryset, name, value):
+        """
+        Filters records up to the end of the given day.
+        """
+        return queryset.filter(**{f'{name}__lt': value + timedelta(days=1)})
 
 
-class BaseRangeFilterSet(FilterSet):
+class BaseRangeFilterSet(ShortCircuitFilterSet):
     """
     A reusable base class for numeric range filtering on a given list or tuple of numeric fields.
     The iterable is to be delared as 'range_fields'.
@@ -35,17 +80,7 @@ class BaseRangeFilterSet(FilterSet):
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
-        if not hasattr(cls, 'Meta') or not hasattr(cls.Meta, 'model'):
-            raise TypeError(f"{cls.__name__} must define a Meta.model")
-        for field in getattr(cls, 'range_fields', []):
-            label = field.replace('_', ' ').title()
-            cls.base_filters[f"{field}_gte"] = NumberFilter(
-                field_name=field,
-                lookup_expr='gte',
-                label=f"Min {label}"
-            )
-            cls.base_filters[f"{field}_lte"] = NumberFilter(
-                field_name=field,
-                lookup_expr='lte',
-                label=f"Max {label}"
-            )
\ No newline at end of file
+        _check_meta_model(cls)
+        cls.declared_filters.update(
+            _build_range_filters(cls.range_fields, NumberFilter, ('Min {}', 'Max {}'))
+        )
@@ -1,3 +1,30 @@
+from functools import lru_cache
+from django.contrib.auth.models import Group
+
+
+@lru_cache(maxsize=None)
+def get_group_ids():
+    """
+    Returns the id of every group keyed by name, loaded in a single query once per process.
+    Groups are a small, nearly static set: the cache is cleared whenever
+    a Group is saved or deleted (see store.signals).
+    """
+    return dict(Group.objects.values_list('name', 'id'))
+
+
+def _get_group_names(user):
+    """
+    Returns the lowercased group names of the user as a frozenset.
+    The set is fetched once and cached on the user instance, so that repeated
+    role checks within the same request don't hit the database again.
+    """
+    if not hasattr(user, '_cached_group_names'):
+        user._cached_group_names = frozenset(
+            name.lower() for name in user.groups.values_list('name', flat=True)
+        ) if user.is_authenticated else frozenset()
+    return user._cached_group_names
+
+
 def is_role(user, role: str) -> bool:
     """
     Checks whether a user belongs to a role/group.
@@ -6,16 +33,30 @@ def is_role(user, role: str) -> bool:
     role = role.strip().lower()
     if role == 'admin':
         return user.is_superuser
-    return user.groups.filter(name__iexact=role).exists()
+    return role in _get_group_names(user)
 
 
 def get_role(user):
     """
     Returns the role name string for the user.
     If not in a known group, falls back to 'customer' or 'anonymous'.
+    The role is resolved once and cached on the user instance, like its group names:
+    views, serializers and throttles of the same request all share request.user.
     """
-    roles = ['admin', 'manager', 'delivery']
-    for role in roles:
-        if is_role(user, role):
+    try:
+        return user._cached_role
+    except AttributeError:
+        user._cached_role = _resolve_role(user)
+        return user._cached_role
+
+
+def _resolve_role(user):
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'admin'
+    group_names = _get_group_names(user)
+    for role in ('manager', 'delivery'):
+        if role in group_names:
             return role
-    return 'customer' if user.is_authenticated else 'anonymous'
\ No newline at end of file
+    return 'customer'
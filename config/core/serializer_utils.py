@@ -1,20 +1,108 @@
+import re
+import threading
+from bleach.sanitizer import Cleaner
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import serializers
 from rest_framework.reverse import reverse
 
+# Characters bleach may rewrite: markup delimiters, entities and control characters.
+_SANITIZABLE_CHARS = re.compile(r'[<>&\x00-\x08\x0b-\x1f]')
+
+# bleach Cleaners hold parser state and are not thread-safe: one pair per thread.
+_cleaners = threading.local()
+
+
+class LocalDateTimeField(serializers.DateTimeField):
+    """
+    Read-side DateTimeField rendering values as ISO 8601 in the current time zone,
+    offset included (e.g. '+00:00' rather than DRF's 'Z').
+    The time zone is resolved once per field, i.e. once per list response.
+    """
+    @cached_property
+    def current_timezone(self):
+        return timezone.get_current_timezone()
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return value.astimezone(self.current_timezone).isoformat()
+
 
 def obtain_list_url(serializer, basename):
     """
     Generates a 'back to list' URL with the appropriate view basename for list navigation.
+    The URL is the same for every row, so it is reversed once and memoized on the serializer
+    (with many=True, the child serializer is shared by all rows).
     """
-    request = serializer.context.get('request')
-    url  = reverse(f'{basename}-list', request=request)
-    return f'Back to list: {url}'
+    try:
+        return serializer._list_url
+    except AttributeError:
+        request = serializer.context.get('request')
+        url  = reverse(f'{basename}-list', request=request)
+        serializer._list_url = f'Back to list: {url}'
+        return serializer._list_url
+
+def is_list_mode(serializer):
+    """
+    Tells whether the serializer is rendering the 'list' action of its view.
+    Views can precompute the decision in the serializer context as '_list_mode'.
+    Otherwise it is computed once and memoized on the serializer instance
+    (with many=True, the child serializer is shared by all rows).
+    """
+    try:
+        return serializer._list_mode
+    except AttributeError:
+        if '_list_mode' in serializer.context:
+            serializer._list_mode = serializer.context['_list_mode']
+            return serializer._list_mode
+        request = serializer.context.get('request')
+        serializer._list_mode = bool(request and request.parser_context.get('view').action == 'list')
+        return serializer._list_mode
 
 def handle_representation(serializer, data, list_fields):
     """
     Optimizes list vs. detail views by selectively displaying fields in list mode.
     Used for consistent minimalist API responses in collections.
+    Rows rendered by a list serializer (declaring exactly 'list_fields') are returned as they are.
     """
-    request = serializer.context.get('request')
-    if request and request.parser_context.get('view').action == 'list':
+    if is_list_mode(serializer):
+        if data.keys() == set(list_fields):
+            return data
         return {field: data[field] for field in list_fields}
-    return {field: data[field] for field in data.keys() if field!='url'}
+    data.pop('url', None)
+    return data
+
+def needs_sanitizing(value):
+    """
+    Tells whether bleach could alter the given text.
+    Plain text without markup, entities or control characters comes out of bleach unchanged,
+    so cleaning it can be skipped.
+    """
+    return bool(value) and _SANITIZABLE_CHARS.search(value) is not None
+
+def _get_cleaner(kind):
+    """
+    Returns this thread's 'strict' (no HTML at all) or 'rich' (bleach defaults) Cleaner,
+    building it on first use instead of on every bleach.clean() call.
+    """
+    cleaner = getattr(_cleaners, kind, None)
+    if cleaner is None:
+        if kind == 'strict':
+            cleaner = Cleaner(tags=[], attributes={}, strip=True)
+        else:
+            cleaner = Cleaner()
+        setattr(_cleaners, kind, cleaner)
+    return cleaner
+
+def sanitize_text(value):
+    """
+    Strict sanitization for CharFields: strips every HTML tag.
+    """
+    return _get_cleaner('strict').clean(value) if needs_sanitizing(value) else value
+
+def sanitize_rich_text(value):
+    """
+    Default sanitization for TextFields: keeps bleach's allowed tags for rich formatting.
+    """
+    return _get_cleaner('rich').clean(value) if needs_sanitizing(value) else value
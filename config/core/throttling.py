@@ -1,4 +1,4 @@
-from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
+from rest_framework.throttling import BaseThrottle, UserRateThrottle, AnonRateThrottle
 from .roles import get_role
 
 class CustomerThrottle(UserRateThrottle):
@@ -10,20 +10,29 @@ class ManagerThrottle(UserRateThrottle):
 class DeliveryThrottle(UserRateThrottle):
     scope = 'delivery'
 
-def get_role_throttle(user):
+# Throttle instances keep per-request state (key, history, timestamps), so only the
+# role -> class mapping is shared; a fresh instance is created for each request.
+ROLE_THROTTLE_CLASSES = {
+    'admin': ManagerThrottle,
+    'manager': ManagerThrottle,
+    'delivery': DeliveryThrottle,
+    'customer': CustomerThrottle,
+    'anonymous': AnonRateThrottle,
+}
+
+class RoleThrottle(BaseThrottle):
     """
-    Returns the appropriate throttle class based on the user's role.
+    Throttles each request with the throttle of the requesting user's role.
     - Admins and Managers get ManagerThrottle
     - Delivery users get DeliveryThrottle
     - Customers (all others) get CustomerThrottle
     - Unauthenticated users get AnonRateThrottle
+    Declared once in 'throttle_classes' instead of a 'get_throttles' override per view.
+    The role is the one cached on request.user (see config.core.roles.get_role).
     """
-    role = get_role(user)
-    if not user.is_authenticated:
-        return [AnonRateThrottle()]
-    if role in ('admin', 'manager'):
-        return [ManagerThrottle()]
-    if role == 'delivery':
-        return [DeliveryThrottle()]
-    return [CustomerThrottle()]
-    
\ No newline at end of file
+    def allow_request(self, request, view):
+        self.throttle = ROLE_THROTTLE_CLASSES[get_role(request.user)]()
+        return self.throttle.allow_request(request, view)
+
+    def wait(self):
+        return self.throttle.wait()
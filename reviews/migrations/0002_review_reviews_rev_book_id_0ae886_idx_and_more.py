@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 11:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        ('store', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['book', '-created_at'], name='reviews_rev_book_id_0ae886_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['book', 'rating'], name='reviews_rev_book_id_f6c98f_idx'),
+        ),
+    ]
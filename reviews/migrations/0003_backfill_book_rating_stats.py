@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 11:41
+
+from django.db import migrations
+from django.db.models import Avg, Count
+
+
+def backfill_book_rating_stats(apps, schema_editor):
+    Book = apps.get_model('store', 'Book')
+    Review = apps.get_model('reviews', 'Review')
+    stats = Review.objects.values('book_id').annotate(avg_rating=Avg('rating'), review_count=Count('id'))
+    for row in stats:
+        Book.objects.filter(pk=row['book_id']).update(avg_rating=row['avg_rating'], review_count=row['review_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_review_reviews_rev_book_id_0ae886_idx_and_more'),
+        ('store', '0002_book_avg_rating_review_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_book_rating_stats, migrations.RunPython.noop),
+    ]
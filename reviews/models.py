@@ -18,4 +18,8 @@ class Review(models.Model):
 
     class Meta:
         unique_together = ('user', 'book')  # Only one review per user per book
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['book', '-created_at']),   # per-book listing in default order
+            models.Index(fields=['book', 'rating']),        # per-book rating range filters
+        ]
\ No newline at end of file
@@ -1,11 +1,8 @@
-from django.utils import timezone
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
 from rest_framework.reverse import reverse
 from config.core import serializer_utils
 from store.models import Book
 from .models import Review
-import bleach
 
 class ReviewSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
@@ -25,15 +22,20 @@ class ReviewSerializer(serializers.ModelSerializer):
         view_name='book-detail',
         read_only=True
     )
+    created_at = serializer_utils.LocalDateTimeField(read_only=True)
+    updated_at = serializer_utils.LocalDateTimeField(read_only=True)
     url = serializers.SerializerMethodField()
     list_url = serializers.SerializerMethodField()
 
+    LIST_FIELDS = ('id', 'customer', 'book_display', 'book_url', 'rating', 'title', 'comment', 'created_at', 'url')
+
     def validate(self, attrs):        
         # Strict sanitization for CharFields (No HTML tags at all)
         if 'title' in attrs:
-            attrs['title'] = bleach.clean(attrs.get('title'), tags=[], attributes={}, strip=True)
+            attrs['title'] = serializer_utils.sanitize_text(attrs['title'])
         # Default sanitization for TextFields (allowing rich formatting)
-        attrs['comment'] = bleach.clean(attrs.get('comment', ''))
+        if 'comment' in attrs:
+            attrs['comment'] = serializer_utils.sanitize_rich_text(attrs['comment'])
         
         rating = attrs.get('rating', None)
         m = 'Please enter an integer value between 1 and 5.'
@@ -46,35 +48,41 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data =  super().to_representation(instance)
-        if instance.created_at:
-            data['created_at'] = timezone.localtime(instance.created_at).isoformat()
-        if instance.updated_at:
-            data['updated_at'] = timezone.localtime(instance.updated_at).isoformat()
-        list_representation_fields = ['id', 'customer',  'book_display', 'book_url', 'rating', 'title', 'comment', 'created_at', 'url']
-        return serializer_utils.handle_representation(self, data=data, list_fields=list_representation_fields)
+        return serializer_utils.handle_representation(self, data=data, list_fields=self.LIST_FIELDS)
+
+    def _get_reviews_url(self, book_id):
+        """
+        Reverses the reviews list URL of a book once per serializer instance.
+        With many=True the child serializer is shared, so a whole page resolves it only once.
+        """
+        reviews_urls = self.__dict__.setdefault('_reviews_urls', {})
+        if book_id not in reviews_urls:
+            request = self.context.get('request')
+            reviews_urls[book_id] = reverse('reviews:reviews-by-book', kwargs={'book_id': book_id}, request=request)
+        return reviews_urls[book_id]
 
     def get_url(self, obj):
-        request = self.context.get('request')
-        return reverse('reviews:review-detail', kwargs={
-            'book_id': obj.book.id,
-            'pk': obj.pk
-        }, request=request)
+        # 'reviews:review-detail' is nested right under 'reviews:reviews-by-book' (see reviews/urls.py)
+        return f'{self._get_reviews_url(obj.book_id)}/{obj.pk}'
 
     def get_list_url(self, obj):
         """
         Generates a 'back to list' URL with the appropriate view basename for list navigation.
         """
-        request = self.context.get('request')
-        url  = reverse('reviews:reviews-by-book',  kwargs={
-            'book_id': obj.book.id,
-            }, request=request)
-        return f'Back to list: {url}'
-        
+        return f'Back to list: {self._get_reviews_url(obj.book_id)}'
 
     class Meta:
         model = Review
         fields = ['id', 'user', 'customer', 'book', 'book_display', 'book_url', 'rating', 'title', 'comment', 'created_at', 'updated_at', 'url', 'list_url']
-        validators = [UniqueTogetherValidator(
-            queryset=Review.objects.all(),
-            fields=['user', 'book'],
-            message='You have already posted a review for this book.')]
\ No newline at end of file
+        # One review per user per book is enforced by the DB unique constraint (see ReviewViewSet.perform_create)
+        validators = []
+
+
+class ReviewListSerializer(ReviewSerializer):
+    """
+    Lightweight variant of ReviewSerializer for the list action.
+    Only the list representation fields are declared, so detail-only fields
+    (e.g. 'list_url') are never computed for collection rows.
+    """
+    class Meta(ReviewSerializer.Meta):
+        fields = list(ReviewSerializer.LIST_FIELDS)
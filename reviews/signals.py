@@ -0,0 +1,27 @@
+from django.db.models import Avg, Count
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from store.models import Book
+from .models import Review
+
+
+def refresh_book_rating(book_id):
+    """
+    Recomputes the denormalized review stats (average rating and review count) of a book.
+    A single aggregate on the book's reviews, served by the (book, rating) index.
+    """
+    stats = Review.objects.filter(book_id=book_id).aggregate(avg_rating=Avg('rating'), review_count=Count('id'))
+    Book.objects.filter(pk=book_id).update(**stats)
+
+
+@receiver(post_save, sender=Review)
+def update_book_rating_on_save(sender, instance, **kwargs):
+    refresh_book_rating(instance.book_id)
+
+
+@receiver(post_delete, sender=Review)
+def update_book_rating_on_delete(sender, instance, origin=None, **kwargs):
+    # Cascading from the deletion of the book itself, either as an instance or as a queryset
+    if isinstance(origin, Book) or getattr(origin, 'model', None) is Book:
+        return
+    refresh_book_rating(instance.book_id)
@@ -1,9 +1,15 @@
+from functools import cached_property
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from rest_framework import viewsets
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import NotFound, ValidationError
 from store.models import Book
-from config.core.throttling import get_role_throttle
+from config.core.throttling import RoleThrottle
 from .models import Review
-from .serializers import ReviewSerializer
+from .serializers import ReviewSerializer, ReviewListSerializer
 from .permissions import ReviewPermission
 from .filters import ReviewFilter
 
@@ -11,13 +17,22 @@ from .filters import ReviewFilter
 class ReviewViewSet(viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = [ReviewPermission]
+    throttle_classes = [RoleThrottle]
     filterset_class = ReviewFilter
     ordering_fields = ['rating', 'created_at', 'updated_at']
     search_fields = ['user__username']
+    WRITE_ACTIONS = ('create', 'update', 'partial_update')
+    cache_timeout = 60  # seconds reviews responses are cached for (and max-age sent to clients)
+
+    @cached_property
+    def _book(self):
+        # Only the columns needed by `Book.__str__` and URL building are loaded.
+        return Book.objects.filter(id=self.kwargs['book_id']).only('id', 'title', 'author').first()
 
     def get_book(self):
         """
         Resolve the parent Book from the URL kwarg `book_id`.
+        The lookup is cached for the lifetime of the view instance (i.e. the request).
 
         Returns
         -------
@@ -29,8 +44,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
         NotFound
             If no book exists with the given `book_id`.
         """
-        book_id = self.kwargs.get('book_id')
-        book = Book.objects.filter(id=book_id).first()
+        book = self._book
         if not book:
             raise NotFound('Book not found.')
         return book
@@ -41,31 +55,86 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
         Flow
         ----
-        1) Ensure the parent book exists (404 otherwise).
-        2) Return `Review` queryset filtered by that book, with
+        1) Return `Review` queryset filtered by the `book_id` column, with
            `select_related('user', 'book')` for efficient DB access.
+           The parent book existence is only checked when nothing is found
+           (see `list` and `get_object`), saving a query on the common path.
+        2) Restrict the joined user/book rows to the columns their `__str__`
+           renders (no password hash, no book blurb, ...). For lists, also skip
+           the review columns `ReviewListSerializer` doesn't render.
         """
-        book = self.get_book()
-        return (
+        queryset = (
             Review.objects
             .select_related('user', 'book')
-            .filter(book=book)
+            .filter(book_id=self.kwargs['book_id'])
         )
+        review_fields = ('id', 'rating', 'title', 'comment', 'created_at')
+        if self.action != 'list':
+            review_fields += ('updated_at',)
+        return queryset.only(*review_fields, 'user__username', 'book__title', 'book__author')
+
+    def _cache_version_key(self):
+        return f"reviews:book:{self.kwargs['book_id']}:version"
+
+    def cache_per_book(self, handler):
+        """
+        Wrap a read handler with Django's page cache, keyed per book and per cache version.
+        Responses also vary on the `Authorization` and `Cookie` headers (JWT and session
+        authentication), since the browsable API output depends on the authenticated user.
+        Writes on the book's reviews bump the version (see `invalidate_cached_reviews`),
+        which orphans every cached page of that book at once.
+        """
+        version = cache.get_or_set(self._cache_version_key(), 0, timeout=None)
+        key_prefix = f"reviews-{self.kwargs['book_id']}-v{version}"
+        return cache_page(self.cache_timeout, key_prefix=key_prefix)(vary_on_headers('Authorization', 'Cookie')(handler))
+
+    def invalidate_cached_reviews(self):
+        try:
+            cache.incr(self._cache_version_key())
+        except ValueError:
+            cache.set(self._cache_version_key(), 1, timeout=None)
+
+    def list(self, request, *args, **kwargs):
+        return self.cache_per_book(self._list)(request, *args, **kwargs)
+
+    def _list(self, request, *args, **kwargs):
+        """
+        List the reviews of the parent book.
+        An empty page may mean the book doesn't exist: only then is it looked up (404 otherwise).
+        """
+        response = super().list(request, *args, **kwargs)
+        if not response.data['results']:
+            self.get_book()
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cache_per_book(super().retrieve)(request, *args, **kwargs)
 
     def get_serializer_context(self):
         """
-        Add a best-effort `book` to the serializer context.
+        Add the list-vs-detail decision used by `handle_representation`, and
+        a best-effort `book` for write actions.
+        Read actions render each review's own (joined) book, so the lookup is skipped.
 
         Returns
         -------
         dict
-            Base context plus `book` (or None if not found).
+            Base context plus `_list_mode` and, for write actions, `book` (or None if not found).
         """
         context = super().get_serializer_context()
-        book_id = self.kwargs.get('book_id')
-        context['book'] = Book.objects.filter(id=book_id).first()
+        context['_list_mode'] = self.action == 'list'
+        if self.action in self.WRITE_ACTIONS:
+            context['book'] = self._book
         return context
 
+    def get_serializer_class(self):
+        """
+        Use the lightweight list serializer for collections, the full one otherwise.
+        """
+        if self.action == 'list':
+            return ReviewListSerializer
+        return ReviewSerializer
+
     def get_serializer(self, *args, **kwargs):
         """
         Initialize the serializer and, for write actions, inject the parent book ID.
@@ -77,7 +146,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
           This keeps validator logic (e.g., unique (user, book)) consistent even
           if the client omits `book` in the payload.
         """
-        if self.action in ('create', 'update', 'partial_update') and 'data' in kwargs:
+        if self.action in self.WRITE_ACTIONS and 'data' in kwargs:
             ctx_book = self.get_serializer_context().get('book')
             if ctx_book:
                 mutable = kwargs['data'].copy()
@@ -85,8 +154,6 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 kwargs['data'] = mutable
         return super().get_serializer(*args, **kwargs)
 
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
     def get_object(self):
         """
@@ -94,11 +161,12 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
         Flow
         ----
-        1) Ensure the parent book exists (404 otherwise).
-        2) Resolve the review via the standard DRF lookup.
-        3) Verify the review actually belongs to the `book_id` in the URL.
+        1) Resolve the review via the standard DRF lookup, on a queryset
+           already scoped to the `book_id` in the URL. If nothing matches,
+           ensure the parent book exists ('Book not found.' 404 otherwise).
+        2) Verify the review actually belongs to the `book_id` in the URL.
            If mismatched, raise 404 to prevent cross-book access.
-        4) Run object-level permission checks.
+        3) Run object-level permission checks.
 
         Returns
         -------
@@ -108,15 +176,36 @@ class ReviewViewSet(viewsets.ModelViewSet):
         Raises
         ------
         NotFound
-            If the review does not belong to the specified book.
+            If the parent book doesn't exist, or the review does not belong to it.
         """
-        self.get_book()
-        obj = super().get_object()
-        if obj.book.id != int(self.kwargs.get('book_id')):
+        try:
+            obj = super().get_object()
+        except Http404:
+            self.get_book()
+            raise
+        if obj.book_id != self.kwargs['book_id']:
             raise NotFound('This review does not belong to the specified book.')
         self.check_object_permissions(self.request, obj)
         return obj
 
     def perform_create(self, serializer):
+        """
+        Saves the review for the parent book.
+        The (user, book) uniqueness is left to the DB constraint, which saves
+        a validation SELECT on every write.
+        """
         book = self.get_book()
-        serializer.save(user=self.request.user, book=book)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user, book=book)
+        except IntegrityError:
+            raise ValidationError({'non_field_errors': ['You have already posted a review for this book.']})
+        self.invalidate_cached_reviews()
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self.invalidate_cached_reviews()
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        self.invalidate_cached_reviews()
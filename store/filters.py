@@ -1,16 +1,15 @@
 import django_filters
 from config.core.base_filters import BaseRangeFilterSet, BaseDateRangeFilterSet
 from .models import Book, Cart, Order, OrderHistory
-from .services.queryset_annotators import annotate_price, annotate_avg_rating
+from .services.queryset_annotators import annotate_price
 
 
-class BookFilter(BaseRangeFilterSet, BaseDateRangeFilterSet):
+class BookFilter(BaseRangeFilterSet):
     """
     Filter class for querying books based on publication year, discount range,
     price range (via annotation), format, and availability.
     """
-    range_fields = ['discount']
-    date_fields = ['first_publication_year']
+    range_fields = ['discount', 'first_publication_year']
     is_bc = django_filters.BooleanFilter(field_name='is_bc', label='BCE')
     price_min = django_filters.NumberFilter(method='filter_price_min', label='Min Selling Price')
     price_max = django_filters.NumberFilter(method='filter_price_max', label='Max Selling Price')
@@ -31,11 +30,17 @@ class BookFilter(BaseRangeFilterSet, BaseDateRangeFilterSet):
 
 
     def filter_rating_min(self, queryset, name, value):
-        return annotate_avg_rating(queryset).filter(average_rating__gte=value)    
+        """
+        Filters books whose average rating (denormalized on Book) is at least the specified value.
+        """
+        return queryset.filter(avg_rating__gte=value)
 
 
     def filter_rating_max(self, queryset, name, value):
-        return annotate_avg_rating(queryset).filter(average_rating__lte=value)
+        """
+        Filters books whose average rating (denormalized on Book) is at most the specified value.
+        """
+        return queryset.filter(avg_rating__lte=value)
 
 
     class Meta:
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='avg_rating',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-15 12:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0002_book_avg_rating_review_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title', 'author', 'stock', '-edition'], name='store_book_title_362800_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['discount'], name='store_book_discoun_6030d8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['first_publication_year'], name='store_book_first_p_5d3c2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['language'], name='store_book_languag_8d81c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['total'], name='store_order_total_2b7a3a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderhistory',
+            index=models.Index(fields=['order', '-timestamp'], name='store_order_order_i_e8a8d4_idx'),
+        ),
+    ]
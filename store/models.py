@@ -85,6 +85,9 @@ class Book(models.Model):
     stock = models.ForeignKey(Stock, on_delete=models.PROTECT, default=1)
     baseprice = models.DecimalField(max_digits=6, decimal_places=2, db_index=True)
     discount = models.PositiveSmallIntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    # Denormalized review stats, kept up to date by the reviews app signals (see reviews/signals.py)
+    avg_rating = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True, editable=False, db_index=True)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f'{self.title}, by {self.author}'
@@ -92,6 +95,12 @@ class Book(models.Model):
     class Meta:
         unique_together = ['title', 'author', 'publisher', 'edition', 'language', 'book_format']
         ordering = ['title','author', 'stock', '-edition']
+        indexes = [
+            models.Index(fields=['title', 'author', 'stock', '-edition']),  # paginated listing in default order
+            models.Index(fields=['discount']),                              # ordering and range filters
+            models.Index(fields=['first_publication_year']),                # range filters
+            models.Index(fields=['language']),                              # exact filter
+        ]
     
 
 class Cart(models.Model):
@@ -119,6 +128,9 @@ class Order(models.Model):
     when_last_update = models.DateTimeField(db_index=True, auto_now=True)
     class Meta:
         ordering = ['status__title', 'user']
+        indexes = [
+            models.Index(fields=['total']),     # ordering and range filters
+        ]
 
 
 
@@ -141,4 +153,7 @@ class OrderHistory(models.Model):
     action = models.CharField(max_length=255, default='', blank=True)
     class Meta:
         ordering = ['order', '-timestamp']
+        indexes = [
+            models.Index(fields=['order', '-timestamp']),   # per-order listing in default order
+        ]
 
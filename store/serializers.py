@@ -1,16 +1,18 @@
-from django.contrib.auth.models import User
+import copy
+import re
+from django.contrib.auth.models import Group, User
 from django.core.validators import MinValueValidator
-from django.utils import timezone
+from django.db.models import Exists, OuterRef
+from django.utils.functional import cached_property
 from rest_framework import serializers
 from rest_framework.reverse import reverse
-from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
+from rest_framework.validators import UniqueValidator
 from stdnum import isbn as stdnum_isbn
 from datetime import date
 from config.core import serializer_utils
 from config.core.roles import get_role
-from .models import *
+from .models import Address, Book, BookFormat, Cart, Country, Genre, Order, OrderHistory, OrderItem, OrderStatus, Stock
 from .services.order_updater import OrderUpdater
-import bleach
 
 
 class GroupUserSerializer(serializers.ModelSerializer):
@@ -28,9 +30,25 @@ class SluggedTitleSerializer(serializers.HyperlinkedModelSerializer):
     Abstract serializer for models with 'title' and 'slug' fields.
     Includes basic sanitization of user input.
     """
+    # Fields built from the model, per serializer class (see 'get_fields')
+    _built_fields = {}
+
+    def get_fields(self):
+        """
+        Introspects the model once per serializer class and hands out copies of the result,
+        which is a fraction of the cost of rebuilding the fields for every response.
+        Lookup-table fields don't depend on the request, so they can be shared this way.
+        """
+        fields = self._built_fields.get(type(self))
+        if fields is None:
+            fields = self._built_fields[type(self)] = super().get_fields()
+        return copy.deepcopy(fields)
+
     def validate(self, attrs):
-        attrs['title'] = bleach.clean(attrs['title'])
-        return super().validate(attrs)
+        # 'title' is absent from partial updates that don't touch it
+        if 'title' in attrs:
+            attrs['title'] = serializer_utils.sanitize_rich_text(attrs['title'])
+        return attrs
         
     class Meta:
         abstract = True
@@ -98,19 +116,35 @@ class ISBNField(serializers.CharField):
     This field:
     - Accepts hyphenated or spaced ISBN strings from user input.
     - Strips all hyphens and spaces using stdnum.isbn.compact.
-    - Validates the cleaned ISBN using stdnum.isbn.is_valid.
+    - Validates the cleaned ISBN's format and check digit.
     - Returns the cleaned ISBN to ensure consistency across storage and uniqueness checks.
 
     Raises:
         serializers.ValidationError: If the cleaned ISBN is not valid.
     """
+    # Same rules as stdnum.isbn.is_valid, checked on the already compacted value
+    # instead of compacting it a second time.
+    ISBN10_PATTERN = re.compile(r'[0-9]{9}[0-9X]')
+    ISBN13_PATTERN = re.compile(r'97[89][0-9]{10}')
+    ISBN10_WEIGHTS = tuple(range(10, 0, -1))
+    ISBN13_WEIGHTS = (1, 3) * 6 + (1,)
+
+    @classmethod
+    def has_valid_checksum(cls, cleaned):
+        if cls.ISBN10_PATTERN.fullmatch(cleaned):
+            digits = (10 if c == 'X' else int(c) for c in cleaned)
+            return sum(w * d for w, d in zip(cls.ISBN10_WEIGHTS, digits)) % 11 == 0
+        if cls.ISBN13_PATTERN.fullmatch(cleaned):
+            return sum(w * int(c) for w, c in zip(cls.ISBN13_WEIGHTS, cleaned)) % 10 == 0
+        return False
+
     def to_internal_value(self, data):
         try:
             cleaned = stdnum_isbn.compact(data)
         except Exception:
             raise serializers.ValidationError("Could not parse ISBN")
         
-        if not stdnum_isbn.is_valid(cleaned):
+        if not self.has_valid_checksum(cleaned):
             raise serializers.ValidationError("Enter a valid ISBN-10 or ISBN-13")
         
         return cleaned
@@ -161,63 +195,62 @@ class BookSerializer(serializers.HyperlinkedModelSerializer):
         read_only=True
         )
     
-    isbn = ISBNField(
-        max_length=13,
-        validators=[UniqueValidator(queryset=Book.objects.all())]
-        )
+    # Uniqueness is enforced by the DB constraint (see BookViewSet.perform_create)
+    isbn = ISBNField(max_length=13)
     
     first_publication_year = serializers.IntegerField(validators=[MinValueValidator(1)], write_only=True)
     is_bc = serializers.BooleanField(default=False, write_only=True)
     publication_year = serializers.SerializerMethodField()
-    price = serializers.SerializerMethodField()
-    average_rating = serializers.SerializerMethodField()
-    reviews_url = serializers.SerializerMethodField()
+    # Selling price annotated by BookViewSet.get_queryset (see queryset_annotators.annotate_price)
+    price = serializers.DecimalField(max_digits=6, decimal_places=2, coerce_to_string=False, read_only=True)
+    # Denormalized review average, stored with 2 decimal places (see reviews/signals.py)
+    average_rating = serializers.DecimalField(source='avg_rating', max_digits=3, decimal_places=2, coerce_to_string=False, read_only=True)
+    reviews_url = serializers.HyperlinkedIdentityField(view_name='reviews:reviews-by-book', lookup_url_kwarg='book_id')
     list_url = serializers.SerializerMethodField()
     add_to_cart_info = serializers.SerializerMethodField()
+
+    LIST_FIELDS = ('id', 'title', 'author', 'genre_display', 'edition', 'book_format_display', 'price', 'average_rating', 'url')
+    STRICT_FIELDS = ('title', 'author', 'publisher', 'language')
         
     def validate(self, attrs):
         # Strict sanitization for CharFields (No HTML tags at all)
-        for field in ['title', 'author', 'publisher', 'language']:
+        for field in self.STRICT_FIELDS:
             if field in attrs:
-                attrs[field] = bleach.clean(attrs.get(field), tags=[], attributes={}, strip=True)
+                attrs[field] = serializer_utils.sanitize_text(attrs[field])
         # Default sanitization for TextFields (allowing rich formatting)
         if 'blurb' in attrs:
-            attrs['blurb'] = bleach.clean(attrs.get('blurb', ''))
+            attrs['blurb'] = serializer_utils.sanitize_rich_text(attrs['blurb'])
 
         # Validate publication_year
         if 'first_publication_year' in attrs:
-            year, is_bc = attrs.get('first_publication_year'), attrs.get('is_bc', False)
+            year, is_bc = attrs['first_publication_year'], attrs.get('is_bc', False)
             if year <= 0:
                 raise serializers.ValidationError({'first_publication_year': 'Year must be greater than 0'})
             if not is_bc and year > date.today().year:
                 raise serializers.ValidationError({'first_publication_year': 'Year cannot be in the future for AD dates.'})
 
         # Ensure edition is positive and makes sense
-        if 'edition' in attrs:
-            edition = attrs.get('edition')
-            if edition is not None and edition < 1:
-                raise serializers.ValidationError({'edition': "Edition must be at least 1."})
+        edition = attrs.get('edition')
+        if edition is not None and edition < 1:
+            raise serializers.ValidationError({'edition': "Edition must be at least 1."})
 
         return attrs
 
     def to_representation(self, instance):
         data =  super().to_representation(instance)
-        list_representation_fields = ['id', 'title', 'author', 'genre_display', 'edition', 'book_format_display', 'price', 'average_rating', 'url']
-        return serializer_utils.handle_representation(self, data=data, list_fields=list_representation_fields)
-
-    def get_reviews_url(self, bookobj):
-        request = self.context.get('request')
-        return reverse('reviews:reviews-by-book', kwargs={'book_id': bookobj.pk}, request=request)
-    
+        return serializer_utils.handle_representation(self, data=data, list_fields=self.LIST_FIELDS)
 
     def get_list_url(self, bookobj):
         return serializer_utils.obtain_list_url(self, basename='book')
 
+    @cached_property
+    def _cart_url(self):
+        # Reversed once per serializer: with many=True the child serializer is shared by all rows
+        return reverse('cart-list', request=self.context.get('request'))
+
     def get_add_to_cart_info(self, bookobj):
-        request = self.context.get('request')
-        url  = reverse('cart-list', request=request,)
         return {
-            'url': url,
+            'url': self._cart_url,
             'method': 'POST',
             'body': {
                 'book': bookobj.id,
@@ -225,26 +258,76 @@ class BookSerializer(serializers.HyperlinkedModelSerializer):
             }
         }
    
-    def get_price(self, bookobj):
-        return round(bookobj.baseprice * (100-bookobj.discount) / 100, 2)
-    
-    def get_average_rating(self, bookobj):
-        avg = getattr(bookobj, 'average_rating', None)
-        return None if avg is None else round(avg, 2)
-
     def get_publication_year(self, bookobj):
         if bookobj.is_bc:
             return str(bookobj.first_publication_year) + ' BC'
         return str(bookobj.first_publication_year)
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('genre', 'book_format', 'stock')
+
     class Meta:
         model = Book
         fields = ['id','title', 'author', 'genre_display', 'genre_url','genre', 'first_publication_year', 'is_bc', 'publication_year', 'blurb', 'publisher', 'edition', 'language', 'book_format_display', 'book_format_url', 'book_format', 'isbn', 'is_new', 'stock_display', 'stock_url', 'stock', 'baseprice', 'price', 'average_rating', 'url', 'discount', 'list_url', 'add_to_cart_info', 'reviews_url']
-        validators = [UniqueTogetherValidator(
-            queryset=Book.objects.all(),
-            fields=['title', 'author', 'publisher', 'edition', 'language', 'book_format']
-        )]        
-    
+        # Uniqueness is enforced by the DB constraints (see BookViewSet.perform_create)
+        validators = []
+
+
+class BookListSerializer(serializers.Serializer):
+    """
+    Lightweight, read-only serializer for the Book list action.
+    Rows are plain dicts selected with .values() (see 'setup_eager_loading'), so no Book
+    instance is built per row, and they are rendered directly into BookSerializer.LIST_FIELDS.
+    The fields are declared for the API metadata (OPTIONS, schema) only.
+    """
+    id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    author = serializers.CharField(read_only=True)
+    genre_display = serializers.CharField(source='genre__title', read_only=True)
+    edition = serializers.IntegerField(read_only=True)
+    book_format_display = serializers.CharField(source='book_format__title', read_only=True)
+    price = serializers.DecimalField(max_digits=6, decimal_places=2, coerce_to_string=False, read_only=True)
+    average_rating = serializers.DecimalField(source='avg_rating', max_digits=3, decimal_places=2, coerce_to_string=False, read_only=True)
+    url = serializers.URLField(read_only=True)
+
+    # 'price' is added by the annotate_price annotation applied on top of these columns
+    COLUMNS = ('id', 'title', 'author', 'genre__title', 'edition', 'book_format__title', 'avg_rating')
+
+    @cached_property
+    def _books_url(self):
+        # 'book-detail' is '<book-list>/<pk>' (see store/urls.py): reversed once for the whole page
+        return reverse('book-list', request=self.context.get('request'))
+
+    @cached_property
+    def _price_field(self):
+        return self.fields['price']
+
+    def to_representation(self, row):
+        # The DB computes 'price' unrounded on some backends: quantize it like BookSerializer does
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'author': row['author'],
+            'genre_display': row['genre__title'],
+            'edition': row['edition'],
+            'book_format_display': row['book_format__title'],
+            'price': self._price_field.to_representation(row['price']),
+            'average_rating': row['avg_rating'],
+            'url': f"{self._books_url}/{row['id']}",
+        }
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Selects the list columns as dicts, joining genre and format for their titles.
+        """
+        return queryset.values(*BookListSerializer.COLUMNS)
+
+
 
 class CartSerializer(serializers.HyperlinkedModelSerializer):
     """
@@ -255,7 +338,7 @@ class CartSerializer(serializers.HyperlinkedModelSerializer):
     customer = serializers.StringRelatedField(source='user', read_only=True)    
     
     book = serializers.PrimaryKeyRelatedField(
-        queryset=Book.objects.all(),
+        queryset=Book.objects.select_related('stock'),     # 'stock' is checked in validate()
         write_only=True
         )    
     book_display = serializers.StringRelatedField(
@@ -276,6 +359,8 @@ class CartSerializer(serializers.HyperlinkedModelSerializer):
 
     list_url = serializers.SerializerMethodField()
 
+    LIST_FIELDS = ('id', 'customer', 'book_display', 'book_url', 'quantity', 'price', 'url')
+
     def validate(self, attrs):
         if attrs.get('quantity') < 1:
             raise serializers.ValidationError({'quantity': 'Quantity cannot be less than 1'})
@@ -319,22 +404,39 @@ class CartSerializer(serializers.HyperlinkedModelSerializer):
         instance.price = instance.unit_price * instance.quantity
         instance.save()
         return instance
-    
+
     def to_representation(self, instance):
         data =  super().to_representation(instance)
-        list_representation_fields = ['id', 'customer', 'book_display', 'book_url', 'quantity', 'price', 'url']
-        return serializer_utils.handle_representation(self, data=data, list_fields=list_representation_fields)
+        return serializer_utils.handle_representation(self, data=data, list_fields=self.LIST_FIELDS)
 
     def get_list_url(self, cartobj):
         return serializer_utils.obtain_list_url(self, basename='cart')
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('user', 'book').only(
+            'id', 'quantity', 'unit_price', 'price',
+            'user__username',               # 'customer'
+            'book__title', 'book__author',  # read by Book.__str__
+        )
+
     class Meta:
         model = Cart
         fields = ['id', 'user', 'customer', 'book', 'book_display', 'book_url', 'quantity', 'unit_price', 'price', 'url', 'list_url']
-        validators = [UniqueTogetherValidator(
-            queryset=Cart.objects.all(),
-            fields=['user', 'book'],
-            message='This book is already in your cart')]
+        # One entry per user per book is enforced by the DB unique constraint (see CartViewSet.perform_create)
+        validators = []
+
+class CartListSerializer(CartSerializer):
+    """
+    Lightweight variant of CartSerializer for the list action.
+    Only the list representation fields are declared, so detail-only fields
+    (e.g. 'unit_price', 'list_url') are never computed for collection rows.
+    """
+    class Meta(CartSerializer.Meta):
+        fields = list(CartSerializer.LIST_FIELDS)
 
 
 class AddressSerializer(serializers.ModelSerializer):
@@ -355,22 +457,28 @@ class AddressSerializer(serializers.ModelSerializer):
         read_only=True
         )
 
+    STRICT_FIELDS = ('recipient', 'state_province', 'city_town', 'zip_code', 'street_name', 'number', 'apartment_suite', 'notes')
 
     def validate(self, attrs):
         # Strict sanitization
-        for field in ['recipient', 'state_province', 'city_town', 'zip_code', 'street_name', 'number', 'apartment_suite', 'notes']:
+        for field in self.STRICT_FIELDS:
             if field in attrs:
-                attrs[field] = bleach.clean(attrs.get(field), tags=[], attributes={}, strip=True)
+                attrs[field] = serializer_utils.sanitize_text(attrs[field])
 
         return attrs
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('user', 'country')
+
     class Meta:
         model = Address
         fields = ['id', 'user', 'customer', 'recipient', 'country_info', 'country_url', 'country', 'state_province', 'city_town', 'zip_code', 'street_name', 'number', 'apartment_suite', 'notes']
-        validators = [UniqueTogetherValidator(
-            queryset=Address.objects.all(),
-            fields=['user', 'recipient', 'country', 'zip_code', 'street_name', 'number'],
-            message='This address is already associated to your account')]
+        # Uniqueness is enforced by the DB unique constraint (see AddressViewSet.perform_create)
+        validators = []
 
 
 class OrderSerializer(serializers.HyperlinkedModelSerializer):
@@ -413,7 +521,10 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         )
 
     deliverer = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.all(),
+        # Delivery Crew membership is resolved in the same query as the user (see validate())
+        queryset=User.objects.annotate(
+            is_deliverer=Exists(Group.objects.filter(user=OuterRef('pk'), name='delivery'))
+        ),
         required=False,
         allow_null=True,
         write_only=True
@@ -423,12 +534,12 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         read_only=True
         )
 
-    when_placed = serializers.DateTimeField(read_only=True)
-    when_last_update = serializers.DateTimeField(read_only=True)
+    when_placed = serializer_utils.LocalDateTimeField(read_only=True)
+    when_last_update = serializer_utils.LocalDateTimeField(read_only=True)
 
     list_url = serializers.SerializerMethodField()
-    orderitems_url = serializers.SerializerMethodField()
-    orderhistory_url = serializers.SerializerMethodField()
+    orderitems_url = serializers.HyperlinkedIdentityField(view_name='orderitems-by-order', lookup_url_kwarg='order_id')
+    orderhistory_url = serializers.HyperlinkedIdentityField(view_name='orderhistory-by-order', lookup_url_kwarg='order_id')
 
     # Optional customer-provided intent field used to trigger review (e.g., refund/cancellation).
     intent = serializers.ChoiceField(
@@ -436,6 +547,10 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         required=False
         )
 
+    LIST_FIELDS = ('id', 'customer', 'status_display', 'total', 'delivery_address_display', 'when_placed', 'url')
+    # Columns read by Address.__str__: enough to validate the pk and render the chosen address
+    ADDRESS_DISPLAY_FIELDS = ('id', 'recipient', 'street_name', 'city_town')
+
     def __init__(self, instance=None, *args, **kwargs):
         """
         Customizes delivery_address queryset based on user role:
@@ -444,17 +559,23 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         """
         super().__init__(instance, *args, **kwargs)
         request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            user = request.user
-            user_role = get_role(user)
-            if user_role in ('admin', 'manager'):
-                self.fields['delivery_address'].queryset = Address.objects.all()
-            else:
-                self.fields['delivery_address'].queryset = Address.objects.filter(user=user)
+        if request and hasattr(request, 'user') and 'delivery_address' in self.fields:    # not declared by OrderListSerializer
+            addresses = Address.objects.only(*self.ADDRESS_DISPLAY_FIELDS)
+            if self.user_role not in ('admin', 'manager'):
+                addresses = addresses.filter(user=request.user)
+            self.fields['delivery_address'].queryset = addresses
+
+    @cached_property
+    def user_role(self):
+        """
+        Role of the requesting user, resolved once per serializer and shared by
+        field selection, queryset narrowing and the OrderUpdater.
+        """
+        return get_role(self.context['request'].user)
 
     def validate(self, attrs):
         deliverer = attrs.get('deliverer', None)
-        if deliverer and not deliverer.groups.filter(name='delivery').exists():
+        if deliverer and not deliverer.is_deliverer:
             raise serializers.ValidationError({'deliverer': 'You can assign this order only to a Delivery Crew member'})
         return super().validate(attrs)
 
@@ -463,8 +584,7 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         'get_fields' is extended in order to control what fields are readable and/or editable by which user
         """
         fields = super().get_fields()
-        user_role = get_role(self.context['request'].user)
-        if user_role not in ('admin', 'manager', 'delivery'):
+        if self.user_role not in ('admin', 'manager', 'delivery'):
             fields.pop('status', None)      # customer can still check the order's status by looking at 'status_display'
             fields.pop('deliverer', None)    # customer doesn't need to know to which deliverer the order gets assigned to
         return fields
@@ -477,34 +597,45 @@ class OrderSerializer(serializers.HyperlinkedModelSerializer):
         return OrderUpdater(
             order = instance,
             user = self.context['request'].user,
+            role = self.user_role,
             data=validated_data
         ).run()
 
     def to_representation(self, instance):
         data =  super().to_representation(instance)
-        if instance.when_placed:
-            data['when_placed'] = timezone.localtime(instance.when_placed).isoformat()
-        if instance.when_last_update:
-            data['when_last_update'] = timezone.localtime(instance.when_last_update).isoformat()
-        list_representation_fields = ['id', 'customer', 'status_display', 'total', 'delivery_address_display', 'when_placed', 'url']
-        return serializer_utils.handle_representation(self, data=data, list_fields=list_representation_fields)
+        return serializer_utils.handle_representation(self, data=data, list_fields=self.LIST_FIELDS)
 
     def get_list_url(self, orderobj):
         return serializer_utils.obtain_list_url(self, basename='order')
-    
-    def get_orderitems_url(self, orderobj):
-        request = self.context.get('request')
-        return reverse('orderitems-by-order', kwargs={'order_id': orderobj.id}, request=request)
-    
-    def get_orderhistory_url(self, orderobj):
-        request = self.context.get('request')
-        return reverse('orderhistory-by-order', kwargs={'order_id': orderobj.id}, request=request)
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('user', 'deliverer', 'delivery_address', 'status')
 
     class Meta:
         model = Order
         fields = ['id', 'user', 'customer', 'status', 'status_display', 'status_url', 'intent', 
         'total', 'deliverer', 'deliverer_display', 'delivery_address', 'delivery_address_display', 'delivery_address_url', 'when_placed', 'when_last_update', 'url', 'list_url', 'orderitems_url', 'orderhistory_url']
 
+class OrderListSerializer(OrderSerializer):
+    """
+    Lightweight variant of OrderSerializer for the list action.
+    Only the list representation fields are declared, so detail-only fields
+    (e.g. 'orderitems_url', 'orderhistory_url') are never computed for collection rows.
+    """
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by the list fields ('deliverer' isn't listed).
+        """
+        return queryset.select_related('user', 'delivery_address', 'status')
+
+    class Meta(OrderSerializer.Meta):
+        fields = list(OrderSerializer.LIST_FIELDS)
+
 
 class OrderItemSerializer(serializers.ModelSerializer):
     order = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -527,11 +658,74 @@ class OrderItemSerializer(serializers.ModelSerializer):
         view_name='book-detail',
         read_only=True
     )
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('order', 'book').only(
+            'id', 'quantity', 'unit_price', 'price',
+            'order__id',                    # Order.__str__ only reads the pk
+            'book__title', 'book__author',  # read by Book.__str__
+        )
+
     class Meta:
         model = OrderItem
         fields = ['order', 'order_display', 'order_url', 'book', 'book_display', 'book_url', 'quantity', 'unit_price', 'price']
 
 
+class OrderItemListSerializer(serializers.Serializer):
+    """
+    Lightweight, read-only serializer for the OrderItem list action.
+    Like BookListSerializer, rows are plain dicts selected with .values() and rendered
+    directly into OrderItemSerializer's fields, with no model instance built per row.
+    The fields are declared for the API metadata (OPTIONS, schema) only.
+    """
+    order = serializers.IntegerField(source='order_id', read_only=True)
+    order_display = serializers.CharField(read_only=True)
+    order_url = serializers.URLField(read_only=True)
+    book = serializers.IntegerField(source='book_id', read_only=True)
+    book_display = serializers.CharField(read_only=True)
+    book_url = serializers.URLField(read_only=True)
+    quantity = serializers.IntegerField(read_only=True)
+    unit_price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
+    price = serializers.DecimalField(max_digits=6, decimal_places=2, read_only=True)
+
+    COLUMNS = ('order_id', 'book_id', 'book__title', 'book__author', 'quantity', 'unit_price', 'price')
+
+    @cached_property
+    def _list_urls(self):
+        # 'order-detail' and 'book-detail' are '<list>/<pk>' (see store/urls.py): reversed once per page
+        request = self.context.get('request')
+        return reverse('order-list', request=request), reverse('book-list', request=request)
+
+    @cached_property
+    def _decimal_field(self):
+        return self.fields['price']
+
+    def to_representation(self, row):
+        orders_url, books_url = self._list_urls
+        to_decimal = self._decimal_field.to_representation
+        return {
+            'order': row['order_id'],
+            'order_display': f"Order object ({row['order_id']})",  # Order has no __str__ of its own
+            'order_url': f"{orders_url}/{row['order_id']}",
+            'book': row['book_id'],
+            'book_display': f"{row['book__title']}, by {row['book__author']}",  # as Book.__str__
+            'book_url': f"{books_url}/{row['book_id']}",
+            'quantity': row['quantity'],
+            'unit_price': to_decimal(row['unit_price']),
+            'price': to_decimal(row['price']),
+        }
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Selects the list columns as dicts, joining the book for its display string.
+        """
+        return queryset.values(*OrderItemListSerializer.COLUMNS)
+
+
 class OrderHistorySerializer(serializers.ModelSerializer):
     order = serializers.PrimaryKeyRelatedField(read_only=True)
     order_display = serializers.StringRelatedField(
@@ -553,13 +747,19 @@ class OrderHistorySerializer(serializers.ModelSerializer):
         view_name='orderstatus-detail',
         read_only=True
     )
-
-    def to_representation(self, instance):
-        data =  super().to_representation(instance)
-        if instance.timestamp:
-            data['timestamp'] = timezone.localtime(instance.timestamp).isoformat()
-        return data
+    timestamp = serializer_utils.LocalDateTimeField(read_only=True)
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Joins the related rows rendered by this serializer, so that lists don't run N+1 queries.
+        """
+        return queryset.select_related('order', 'status').only(
+            'id', 'timestamp', 'performed_by', 'action',
+            'order__id',        # Order.__str__ only reads the pk
+            'status__title',    # read by OrderStatus.__str__
+        )
+
     class Meta:
         model = OrderHistory
         fields = ['order', 'order_display', 'order_url', 'status', 'status_display', 'status_url', 'timestamp', 'performed_by', 'action']
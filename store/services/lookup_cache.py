@@ -0,0 +1,23 @@
+from django.core.cache import cache
+
+
+def _version_key(model):
+    return f'lookups:{model._meta.label_lower}:version'
+
+
+def get_lookup_cache_version(model):
+    """
+    Returns the current cache version of a lookup table (Genre, Stock, Country...).
+    Cached responses are keyed on it, so bumping it orphans all of them at once.
+    """
+    return cache.get_or_set(_version_key(model), 0, timeout=None)
+
+
+def invalidate_lookup_cache(model):
+    """
+    Bumps the cache version of a lookup table (see store.signals).
+    """
+    try:
+        cache.incr(_version_key(model))
+    except ValueError:
+        cache.set(_version_key(model), 1, timeout=None)
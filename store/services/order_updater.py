@@ -1,8 +1,28 @@
+from functools import lru_cache
+from django.db import transaction
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.utils import timezone
 from store.models import OrderStatus, OrderHistory
 from config.core.roles import get_role
 
+
+@lru_cache(maxsize=None)
+def get_order_statuses():
+    """
+    Returns every OrderStatus keyed by slug, loaded in a single query once per process.
+    The table is a small, closed set of reference data: the cache is cleared whenever
+    an OrderStatus is saved or deleted (see store.signals).
+    """
+    return {status.slug: status for status in OrderStatus.objects.all()}
+
+
+def get_status(slug):
+    """
+    Returns the OrderStatus with the given slug from the in-memory table.
+    """
+    return get_order_statuses()[slug]
+
+
 class OrderUpdater:
     """
     Encapsulates business logic for safely updating an order.
@@ -34,24 +54,39 @@ class OrderUpdater:
         }
     }
 
+    # Flattened views of STATUS_TRANSITIONS, built once: (from, to) and (from, to, role) lookups
+    ALLOWED_TRANSITIONS = frozenset(
+        (current, new) for current, targets in STATUS_TRANSITIONS.items() for new in targets
+    )
+    ALLOWED_ROLE_TRANSITIONS = frozenset(
+        (current, new, role) for current, targets in STATUS_TRANSITIONS.items()
+        for new, roles in targets.items() for role in roles
+    )
+
     INTENTS_ORIGIN_STATUSES = {
         # Allowed original statuses for intent types
         'cancellation': ['pending', 'failed'],
         'refund': ['delivered'],
     }
+
+    # Written along with whichever of 'deliverer', 'delivery_address' and 'status' changed
+    TIMESTAMP_FIELD = 'when_last_update'
     
     
-    def __init__(self, *, order, user, data):
+    def __init__(self, *, order, user, data, role=None):
         """
         Initialize the updater with the order instance, the acting user,
         and the validated update data from the serializer.
+        The user's role can be passed in when the caller already resolved it.
         """
         self.order = order
         self.user = user
         self.data = data
-        self.role = get_role(user)
+        self.role = role or get_role(user)
         self.intent = self.data.pop('intent', None)
         self.action_description = ''
+        self.history = None
+        self.updated_fields = set()
 
     def run(self):
         """
@@ -61,13 +96,20 @@ class OrderUpdater:
         3. Optional address change handling
         4. Intent (cancellation/refund) handling
         5. Status transition enforcement and logging
+        The order and its history entry are written in a single transaction,
+        only when something actually changed: a no-op update writes nothing.
         """
         self._check_allowed_fields()
         self._handle_deliverer()
         self._handle_delivery_address()
         self._handle_intent()
         self._handle_status_transition()
-        self.order.save()
+        if not self.updated_fields:
+            return self.order
+        with transaction.atomic():
+            self.order.save(update_fields=[*sorted(self.updated_fields), self.TIMESTAMP_FIELD])
+            if self.history:
+                self.history.save()
         return self.order
     
     def _check_allowed_fields(self):
@@ -97,8 +139,9 @@ class OrderUpdater:
             return
         if new_deliverer != self.order.deliverer:
             self.order.deliverer = new_deliverer
+            self.updated_fields.add('deliverer')
             if self.order.status.slug in ('pending', 'under-review'):
-                self.data['status'] = OrderStatus.objects.get(slug='shipped')
+                self.data['status'] = get_status('shipped')
            
     def _handle_delivery_address(self):
         """
@@ -115,9 +158,10 @@ class OrderUpdater:
             raise ValidationError(f'You cannot change the delivery address at this stage (current status: {current_status.title}).')
 
         self.order.delivery_address = new_address
+        self.updated_fields.add('delivery_address')
 
         if current_status.slug == 'failed':
-            self.data['status'] = OrderStatus.objects.get(slug='under-review')
+            self.data['status'] = get_status('under-review')
 
     def _handle_intent(self):
         """
@@ -128,7 +172,7 @@ class OrderUpdater:
             return
         if self.order.status.slug not in self.INTENTS_ORIGIN_STATUSES[self.intent]:
             raise ValidationError(f'You cannot request {self.intent} at this stage (current status: {self.order.status.title}).')
-        self.data['status'] = OrderStatus.objects.get(slug='under-review')
+        self.data['status'] = get_status('under-review')
         self.action_description = f'Customer requested {self.intent}. Status transitioned to Under Review.'
 
     def _handle_status_transition(self):
@@ -142,25 +186,27 @@ class OrderUpdater:
         current_status = self.order.status
         if not new_status or new_status == self.order.status:
             return
-        allowed_transitions = self.STATUS_TRANSITIONS.get(current_status.slug, {})
-        if new_status.slug not in allowed_transitions:
+        transition = (current_status.slug, new_status.slug)
+        if transition not in self.ALLOWED_TRANSITIONS:
                 raise ValidationError({'status': f'You cannot update an order status from {current_status.title} to {new_status.title}'})
         
-        if self.role not in allowed_transitions[new_status.slug]:
+        if (*transition, self.role) not in self.ALLOWED_ROLE_TRANSITIONS:
             raise PermissionDenied({
                 'status': f'You do not have permission to update this order status from {current_status.title} to {new_status.title}'
             })
         
         self.order.status = new_status
         self.order.when_last_update = timezone.localtime()
+        self.updated_fields.add('status')
         self._log_history(new_status)
 
     def _log_history(self, new_status):
         """
-        Logs the change in order status or customer intent in the OrderHistory table.
+        Prepares the OrderHistory entry logging the change in order status or customer intent.
+        It is saved by run(), together with the order.
         """
         action = self.action_description or f'Status transitioned to {new_status.title}'
-        OrderHistory.objects.create(
+        self.history = OrderHistory(
             order=self.order,
             status=new_status,
             #timestamp=timezone.localtime(),
@@ -1,4 +1,5 @@
-from django.db.models import Avg, F, ExpressionWrapper, DecimalField
+from decimal import Decimal
+from django.db.models import F, Value, ExpressionWrapper, DecimalField
 
 def annotate_price(queryset):
     """
@@ -19,12 +20,9 @@ def annotate_price(queryset):
     """
     return queryset.annotate(
         price=ExpressionWrapper(
-            F('baseprice') * (100 - F('discount')) / 100,
+            # A decimal factor keeps SQLite from integer-dividing whole-number baseprices,
+            # and the arithmetic exact (NUMERIC) on the other backends, like the cart's
+            F('baseprice') * (100 - F('discount')) * Value(Decimal('0.01')),
             output_field=DecimalField(max_digits=6, decimal_places=2)
         )
     )
-
-def annotate_avg_rating(queryset):
-    return queryset.annotate(
-        average_rating=Avg('reviews__rating')
-    )
\ No newline at end of file
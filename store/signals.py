@@ -0,0 +1,30 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import Group
+from config.core.roles import get_group_ids
+from .models import Genre, Stock, BookFormat, OrderStatus, Country
+from .services.lookup_cache import invalidate_lookup_cache
+from .services.order_updater import get_order_statuses
+
+LOOKUP_MODELS = (Genre, Stock, BookFormat, OrderStatus, Country)
+
+
+@receiver(post_save, sender=OrderStatus)
+@receiver(post_delete, sender=OrderStatus)
+def clear_status_cache(sender, **kwargs):
+    get_order_statuses.cache_clear()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def clear_group_cache(sender, **kwargs):
+    get_group_ids.cache_clear()
+
+
+def invalidate_cached_lookups(sender, **kwargs):
+    invalidate_lookup_cache(sender)
+
+
+for model in LOOKUP_MODELS:
+    post_save.connect(invalidate_cached_lookups, sender=model)
+    post_delete.connect(invalidate_cached_lookups, sender=model)
@@ -1,6 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import *
+from .views import (
+    AddressViewSet, BookFormatViewSet, BookViewSet, CartViewSet, CountryViewSet, GenreViewSet,
+    OrderHistoryViewSet, OrderItemViewSet, OrderStatusViewSet, OrderViewSet, StockViewSet, handle_group_users,
+)
 
 router = DefaultRouter(trailing_slash=False)
 router.register(r'genres', viewset=GenreViewSet, basename='genre')
@@ -1,38 +1,51 @@
+from decimal import Decimal
+from itertools import islice
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.db.models import ProtectedError
-from django.contrib.auth.models import User, Group
+from django.db import IntegrityError, transaction
+from django.db.models import ProtectedError, Sum
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
+from django.contrib.auth.models import User
 from rest_framework import status, viewsets
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
-from config.core.roles import get_role, is_role
-from config.core.throttling import get_role_throttle, ManagerThrottle
-from .models import *
-from .serializers import *
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from config.core.roles import get_group_ids, get_role, is_role
+from config.core.throttling import ManagerThrottle, RoleThrottle
+from .models import Address, Book, BookFormat, Cart, Country, Genre, Order, OrderHistory, OrderItem, OrderStatus, Stock
+from .serializers import (
+    AddressSerializer, BookFormatSerializer, BookListSerializer, BookSerializer, CartListSerializer, CartSerializer,
+    CountrySerializer, GenreSerializer, GroupUserSerializer, OrderHistorySerializer, OrderItemListSerializer,
+    OrderItemSerializer, OrderListSerializer, OrderSerializer, OrderStatusSerializer, StockSerializer,
+)
 from .permissions import HandleEmployeeGroupPermission, ReadOnlyOrIsAdminOrManager, CartPermission, AddressPermission
-from .filters import *
-from .services.queryset_annotators import annotate_price, annotate_avg_rating
+from .filters import BookFilter, CartFilter, OrderFilter, OrderHistoryFilter
+from .services.queryset_annotators import annotate_price
+from .services.lookup_cache import get_lookup_cache_version
 
 @api_view(['GET', 'POST', 'DELETE'])
 @permission_classes([HandleEmployeeGroupPermission])
 @throttle_classes([ManagerThrottle])
 def handle_group_users(request, group_name):
     """
-    GET: List all users in a group.
+    GET: List all users in a group, paginated like the viewsets' lists.
     POST: Add a user (by username) to the group.
     DELETE: Remove a user (by username) from the group.
     """
-    try:
-        group = Group.objects.get(name=group_name)
-    except Group.DoesNotExist:
-        return Response({'message': f'{group_name} group does not exist'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    group_id = get_group_ids().get(group_name)
+    if group_id is None:
+        return Response({'message': f'{group_name} group does not exist'}, status=status.HTTP_404_NOT_FOUND)
     
     if request.method == 'GET':
-        group_users = group.user_set.all()
-        serialized = GroupUserSerializer(group_users, many=True)
-        return Response(serialized.data, status=status.HTTP_200_OK)
+        group_users = User.objects.filter(groups__id=group_id).only(*GroupUserSerializer.Meta.fields).order_by('id')
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(group_users, request)
+        serialized = GroupUserSerializer(page, many=True)
+        return paginator.get_paginated_response(serialized.data)
 
     else: #POST or DELETE
         username = request.data.get('username')
@@ -40,21 +53,37 @@ def handle_group_users(request, group_name):
             return Response({'message': 'Username is required.'}, status=status.HTTP_400_BAD_REQUEST)
         user = get_object_or_404(User, username=username)        
         if request.method == 'POST':
-            group.user_set.add(user)
+            user.groups.add(group_id)
             return Response({'message': f'{username} is now a {group_name}'})
 
         if request.method == 'DELETE':
-            group.user_set.remove(user)
+            user.groups.remove(group_id)
             return Response({'message': f'{user.username} is no longer a {group_name}'}, status=status.HTTP_204_NO_CONTENT)
 
-def get_orders(user):
+def save_unique(serializer, conflict_errors, **kwargs):
+    """
+    Helper function. Saves the serializer, leaving uniqueness to the DB constraints
+    instead of a validation SELECT per constraint on every write.
+    A violation raises a ValidationError carrying 'conflict_errors'
+    (or the result of calling it, when the offending constraint needs to be told apart).
+    """
+    try:
+        with transaction.atomic():
+            return serializer.save(**kwargs)
+    except IntegrityError:
+        raise ValidationError(conflict_errors() if callable(conflict_errors) else conflict_errors)
+
+
+def get_orders(user, queryset=None):
     """
     Helper function. Returns the queryset of orders accessible by the user depending on their role.
     - Admin/Manager: all orders
     - Delivery: orders assigned to them
     - Customer: their own orders
+    'queryset' defaults to all orders, without joins: callers rendering orders pass
+    one prepared by their serializer.
     """
-    base_qs = Order.objects.select_related('user', 'deliverer', 'delivery_address', 'status')
+    base_qs = Order.objects.all() if queryset is None else queryset
     role = get_role(user)
     if role in ('admin', 'manager'):
         return base_qs
@@ -63,44 +92,67 @@ def get_orders(user):
     return base_qs.filter(user=user)
 
 
-class GenreViewSet(viewsets.ReadOnlyModelViewSet):
+def get_address_ids(user):
+    """
+    Helper function. Returns the ids of the user's addresses as a tuple.
+    Like the role, they are fetched once and cached on the user instance, i.e. once per request.
+    """
+    if not hasattr(user, '_cached_address_ids'):
+        user._cached_address_ids = tuple(Address.objects.filter(user=user).values_list('id', flat=True))
+    return user._cached_address_ids
+
+
+class LookupViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Base viewset for the small, nearly immutable lookup tables (genres, stocks, formats...).
+    Responses are page-cached per table and per cache version, varying on the `Authorization`
+    and `Cookie` headers like the reviews' cache. Any write on the table bumps its version
+    (see store.signals).
+    """
+    throttle_classes = [RoleThrottle]
+    cache_timeout = 60 * 15
+
+    def cache_per_table(self, handler):
+        model = self.queryset.model
+        key_prefix = f'{model._meta.model_name}-v{get_lookup_cache_version(model)}'
+        return cache_page(self.cache_timeout, key_prefix=key_prefix)(vary_on_headers('Authorization', 'Cookie')(handler))
+
+    def list(self, request, *args, **kwargs):
+        return self.cache_per_table(super().list)(request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cache_per_table(super().retrieve)(request, *args, **kwargs)
+
+
+class GenreViewSet(LookupViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
 
-class StockViewSet(viewsets.ReadOnlyModelViewSet):
+class StockViewSet(LookupViewSet):
     queryset = Stock.objects.all()
     serializer_class = StockSerializer
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
 
-class BookFormatViewSet(viewsets.ReadOnlyModelViewSet):
+class BookFormatViewSet(LookupViewSet):
     queryset = BookFormat.objects.all()
     serializer_class = BookFormatSerializer
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
 
-class OrderStatusViewSet(viewsets.ReadOnlyModelViewSet):
+class OrderStatusViewSet(LookupViewSet):
     queryset = OrderStatus.objects.all()
     serializer_class = OrderStatusSerializer
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
 
-class CountryViewSet(viewsets.ReadOnlyModelViewSet):
+class CountryViewSet(LookupViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
 
 class BookViewSet(viewsets.ModelViewSet):
     serializer_class = BookSerializer
     permission_classes = [ReadOnlyOrIsAdminOrManager]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['author', 'title', 'edition', 'price', 'discount']
     search_fields = ['title', 'author', 'genre__title', 'publisher']
     filterset_class = BookFilter
@@ -108,35 +160,86 @@ class BookViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         Returns books annotated with computed discounted price.
-        Includes prefetches for genre, stock, and format.
+        Includes the joins declared by the serializer (genre, stock, and format),
+        or, for lists, the columns selected as dicts by BookListSerializer.
+        The average rating is read from the denormalized 'Book.avg_rating' column.
+        """
+        baseqs = self.get_serializer_class().setup_eager_loading(Book.objects.all())
+        return annotate_price(baseqs)
+
+    def get_serializer_class(self):
+        """
+        Use the lightweight list serializer for collections, the full one otherwise.
         """
-        baseqs = Book.objects.select_related('genre', 'book_format', 'stock')
-        return annotate_avg_rating(annotate_price(baseqs))
+        if self.action == 'list':
+            return BookListSerializer
+        return BookSerializer
 
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
+
+    def perform_create(self, serializer):
+        save_unique(serializer, lambda: self._conflict_errors(serializer))
+        self._reload_annotated(serializer)
+
+    def perform_update(self, serializer):
+        save_unique(serializer, lambda: self._conflict_errors(serializer))
+        self._reload_annotated(serializer)
+
+    def _conflict_errors(self, serializer):
+        """
+        Tells which of the book's unique constraints a failed save violated.
+        Only runs once the DB has rejected the row.
+        """
+        isbn = serializer.validated_data.get('isbn')
+        instance_pk = serializer.instance.pk if serializer.instance else None
+        if isbn and Book.objects.filter(isbn=isbn).exclude(pk=instance_pk).exists():
+            return {'isbn': ['This field must be unique.']}
+        return {'non_field_errors': ['The fields title, author, publisher, edition, language, book_format must make a unique set.']}
+
+    def _reload_annotated(self, serializer):
+        """
+        Swaps the saved instance with its annotated counterpart,
+        so that the response renders the DB-computed 'price' like reads do.
+        """
+        serializer.instance = self.get_queryset().get(pk=serializer.instance.pk)
     
     def destroy(self, request, *args, **kwargs):
         """
         Attempts to delete a book.
         Fails gracefully if the book is referenced by orders (ProtectedError).
+        Deletes straight from a plain pk filter: the annotated, joined queryset of reads is
+        not needed to find the row, and books have no object-level permissions to check.
         """
-        instance = self.get_object()
         try:
-            self.perform_destroy(instance)
+            books = Book.objects.filter(pk=kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (TypeError, ValueError):     # a non-numeric pk matches no book, as with get_object()
+            raise NotFound('No Book matches the given query.')
+        try:
+            deleted, _ = books.delete()
         except ProtectedError:
             raise ValidationError({
                 'detail': 'Cannot delete this book because it is referenced by one or more orders.'
             })
+        if not deleted:
+            raise NotFound('No Book matches the given query.')
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class CartViewSet(viewsets.ModelViewSet):
     serializer_class = CartSerializer
     permission_classes = [CartPermission]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['unit_price', 'price', 'quantity']
     search_fields = ['user__username', 'book__title', 'book__author']
     filterset_class =  CartFilter
+
+    def get_serializer_class(self):
+        """
+        Use the lightweight list serializer for collections, the full one otherwise.
+        """
+        if self.action == 'list':
+            return CartListSerializer
+        return CartSerializer
+
     def list(self, request, *args, **kwargs):
         """
         Extends list response to include:
@@ -144,21 +247,29 @@ class CartViewSet(viewsets.ModelViewSet):
         - Info about placing an order (URL, method, required body).
         """
         response = super().list(request, *args, **kwargs)
-        cart_total = round(sum(float(item['price']) for item in response.data['results']), 2)
+        if response.data['next'] is None and response.data['previous'] is None:
+            # The page holds the whole cart: no need to ask the DB
+            cart_total = sum((Decimal(item['price']) for item in response.data['results']), Decimal('0'))
+        else:
+            cart_total = self.filter_queryset(self.get_queryset()).aggregate(total=Sum('price'))['total'] or Decimal('0')
+        cart_total = cart_total.quantize(Decimal('0.01'))     # summed as decimals, without float rounding errors
         place_order_url = reverse('order-list', request=request)
-        customer_address_ids = [address.id for address in Address.objects.filter(user=request.user)]
+        customer_address_ids = get_address_ids(request.user)
         response.data['other_info'] = {
             'cart_total': cart_total,
             'place_order_info': {
                 'url': place_order_url,
                 'method': 'POST',
                 'body': {
-                    'delivery_address_id': ' or '.join([str(id) for id in customer_address_ids])
+                    'delivery_address_id': ' or '.join(map(str, customer_address_ids))
                     }
                 }
             }
         return response
 
+    def perform_create(self, serializer):
+        save_unique(serializer, {'non_field_errors': ['This book is already in your cart']})
+
     def get_queryset(self):
         """
         Returns user-specific cart data.
@@ -166,23 +277,20 @@ class CartViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         role = get_role(user)
-        base_qs = Cart.objects.select_related('user', 'book')
+        base_qs = self.get_serializer_class().setup_eager_loading(Cart.objects.all())
         if role in ('admin', 'manager'):
             return base_qs
         return base_qs.filter(user=user)
     
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
 
     @action(detail=False, methods=['delete'], url_path='', url_name='flush_cart')
     def flush_cart(self, request):
         """
         It bulk deletes all cart items for the current user (like a 'flush' cart action)
         """
-        queryset = Cart.objects.filter(user=request.user)   #only cart owners can perform flushing
-        count = queryset.count()
-        queryset.delete()
-        response_message = {'message': f'Cart flushed successfully. {count} item(s) deleted.'} if count != 0 else {'mesasge': 'Your cart is empty.'}
+        # Only cart owners can perform flushing. Nothing references cart items, so the deleted count is the cart's size
+        count, _ = Cart.objects.filter(user=request.user).delete()
+        response_message = {'message': f'Cart flushed successfully. {count} item(s) deleted.'} if count != 0 else {'message': 'Your cart is empty.'}
         response_status = status.HTTP_204_NO_CONTENT if count != 0 else status.HTTP_400_BAD_REQUEST
 
         return Response(response_message, status=response_status)
@@ -191,6 +299,7 @@ class CartViewSet(viewsets.ModelViewSet):
 class AddressViewSet(viewsets.ModelViewSet):
     serializer_class = AddressSerializer
     permission_classes = [AddressPermission]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['user', 'recipient', 'country', 'city_town']
     search_fields = ['user__username', 'recipient', 'country__title', 'city_town', 'street_name']
     filterset_fields = ['user', 'country']
@@ -201,85 +310,142 @@ class AddressViewSet(viewsets.ModelViewSet):
         Regular users see only their own.
         """
         user = self.request.user
-        base_qs = Address.objects.select_related('user', 'country')
+        base_qs = self.get_serializer_class().setup_eager_loading(Address.objects.all())
         if is_role(user, 'admin'):
             return base_qs
         return base_qs.filter(user=user)
+
+    def perform_create(self, serializer):
+        save_unique(serializer, {'non_field_errors': ['This address is already associated to your account']})
+
+    def perform_update(self, serializer):
+        save_unique(serializer, {'non_field_errors': ['This address is already associated to your account']})
     
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
     
 
 class OrderViewSet(viewsets.ModelViewSet):
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['total', 'when_placed', 'status']
     search_fields = ['user__username']
     filterset_class = OrderFilter
+    cart_batch_size = 500   # cart rows turned into order items at a time, see 'create'
+
     def get_queryset(self):
         user = self.request.user
-        return get_orders(user)
+        return get_orders(user, self.get_serializer_class().setup_eager_loading(Order.objects.all()))
+
+    def get_serializer_class(self):
+        """
+        Use the lightweight list serializer for collections, the full one otherwise.
+        """
+        if self.action == 'list':
+            return OrderListSerializer
+        return OrderSerializer
 
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)        
 
     def create(self, request):
         """
         Create method overridden.
-        1.  It retrieves the queryset of items in the Cart of the user sending the request in 'cart_queryset'
-        2.  It computes the total price of items in 'cart_queryset' via sum of their .price attrs
+        1.  It streams the items in the Cart of the user sending the request, in batches of 'cart_batch_size' rows
+        2.  It computes the total price of the items via sum of their prices
         3.  It creates a new Order record and stores the corresponding obj in 'new_order'
-        4.  It instantiates a new queryset ('order_items') by iterating items in 'cart_queryset' and using its original attr execpt for '.user' which is now replaced with 'order'
-        5.  It feeds the 'order_items' queryset to OrderItem via 'bulk_create' for better performance
+        4.  It turns each batch of cart rows into OrderItem objects, replacing '.user' with 'order'
+        5.  It feeds each batch to OrderItem via 'bulk_create' for better performance
         6.  It creates a new OrderHistory object
         7.  It finally 'flushes' the user's cart by deleting 'cart_queryset'    
+        Steps 1-7 run in a single transaction.
+        Only one batch of cart rows is held in memory at a time, however large the cart.
         """
         user = request.user
         serializer = OrderSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         delivery_address = serializer.validated_data['delivery_address']
 
-        cart_queryset = Cart.objects.filter(user=user)
-        if not cart_queryset.exists():
-            return Response({'message': 'No item was found in your cart'}, status=status.HTTP_400_BAD_REQUEST)
-        total = sum(cartobj.price for cartobj in cart_queryset)
-        new_order = Order.objects.create(
-            user=user,
-            delivery_address=delivery_address,
-            total=total,
-            #when_placed=timezone.localtime(),
-            #when_last_update=timezone.localtime()
-            )
-
-        order_items = [OrderItem(
-            order=new_order,
-            book=item.book,
-            quantity=item.quantity,
-            unit_price=item.unit_price,
-            price=item.price,
-            ) for item in cart_queryset]
-
-        OrderItem.objects.bulk_create(order_items)
-
-        OrderHistory.objects.create(
-            order=new_order,
-            #timestamp=timezone.localtime(),
-            performed_by=user,
-            action='Order created'
-            )
-
-        cart_queryset.delete()
+        with transaction.atomic():
+            # Locked until the order is placed, so that a duplicate submission can't order the same items twice
+            cart_queryset = Cart.objects.select_for_update().filter(user=user)
+            rows = cart_queryset.values_list('book_id', 'quantity', 'unit_price', 'price').iterator(chunk_size=self.cart_batch_size)
+            batches = iter(lambda: list(islice(rows, self.cart_batch_size)), [])
+            first_batch = next(batches, None)
+            if first_batch is None:
+                return Response({'message': 'No item was found in your cart'}, status=status.HTTP_400_BAD_REQUEST)
+            new_order = Order.objects.create(
+                user=user,
+                delivery_address=delivery_address,
+                total=sum(price for *_, price in first_batch),
+                #when_placed=timezone.localtime(),
+                #when_last_update=timezone.localtime()
+                )
+            OrderItem.objects.bulk_create(self._order_items(new_order, first_batch))
+
+            later_total = 0
+            for batch in batches:
+                OrderItem.objects.bulk_create(self._order_items(new_order, batch))
+                later_total += sum(price for *_, price in batch)
+            if later_total:
+                new_order.total += later_total
+                new_order.save(update_fields=['total'])
+
+            OrderHistory.objects.create(
+                order=new_order,
+                #timestamp=timezone.localtime(),
+                performed_by=user,
+                action='Order created'
+                )
+
+            cart_queryset.delete()
+
         return Response({'message': 'Your order has been placed successfully',
                             'order_id': new_order.id}, 
                             status=status.HTTP_201_CREATED)
       
+    @staticmethod
+    def _order_items(order, cart_rows):
+        """
+        Turns (book_id, quantity, unit_price, price) cart rows into unsaved items of 'order'.
+        """
+        return [OrderItem(
+            order=order,
+            book_id=book_id,
+            quantity=quantity,
+            unit_price=unit_price,
+            price=price,
+            ) for book_id, quantity, unit_price, price in cart_rows]
+
+
+class OrderScopedMixin:
+    """
+    Mixin for the viewsets nested under an order ('orders/<order_id>/...').
+    The order's accessibility is filtered in the main query: only an empty result
+    costs one more query, telling an inaccessible order from one without records.
+    """
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        order_id = kwargs.get('order_id')
+        data = response.data
+        is_empty = not (data.get('count') if isinstance(data, dict) else data)
+        if order_id and is_empty and not get_orders(request.user).filter(id=order_id).exists():
+            raise NotFound('Order not found or not accessible')
+        return response
 
-class OrderItemViewSet(viewsets.ModelViewSet):
+
+class OrderItemViewSet(OrderScopedMixin, viewsets.ModelViewSet):
     serializer_class = OrderItemSerializer
-    permission_classes=[IsAuthenticated]
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['price', 'quantity']
     search_fields = ['book__title', 'order__user__username']
     filterset_fields = ['order', 'book']
+    def get_serializer_class(self):
+        """
+        Use the lightweight list serializer for collections, the full one otherwise.
+        """
+        if self.action == 'list':
+            return OrderItemListSerializer
+        return OrderItemSerializer
+
     def get_queryset(self):
         """
         Restricts visible OrderItems based on role:
@@ -290,29 +456,23 @@ class OrderItemViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         role = get_role(user)
-        base_qs = OrderItem.objects.select_related('order', 'book')
+        base_qs = self.get_serializer_class().setup_eager_loading(OrderItem.objects.all())
         if role == 'delivery':
             raise PermissionDenied('You don\'t have access to the content of this order')
         order_id = self.kwargs.get('order_id')
         if order_id:
-            orders = get_orders(user)
-            try:
-                order = orders.get(id=order_id)
-                return base_qs.filter(order=order)
-            except Order.DoesNotExist:
-                raise NotFound('Order not found or not accessible')
+            return base_qs.filter(order_id=order_id, order__in=get_orders(user))
         
         if role in ('admin', 'manager'):
             return base_qs
         return base_qs.none()
 
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)
     
 
-class OrderHistoryViewSet(viewsets.ModelViewSet):
+class OrderHistoryViewSet(OrderScopedMixin, viewsets.ModelViewSet):
     serializer_class = OrderHistorySerializer
     permission_classes = [IsAuthenticated]
+    throttle_classes = [RoleThrottle]
     ordering_fields = ['timestamp']
     search_fields = ['order__user__username', 'performed_by__username', 'action']
     filterset_class = OrderHistoryFilter
@@ -322,19 +482,12 @@ class OrderHistoryViewSet(viewsets.ModelViewSet):
         """
         user = self.request.user
         role = get_role(user)
-        base_qs = OrderHistory.objects.select_related('order', 'performed_by')
+        base_qs = self.get_serializer_class().setup_eager_loading(OrderHistory.objects.all())
         order_id = self.kwargs.get('order_id')
         if order_id:
-            orders = get_orders(user)
-            try:
-                order = orders.get(id=order_id)
-                return base_qs.filter(order=order)
-            except Order.DoesNotExist:
-                raise NotFound('Order not found or not accessible')
+            return base_qs.filter(order_id=order_id, order__in=get_orders(user))
         
         if role in ('admin', 'manager'):
             return base_qs
         return base_qs.none()
 
-    def get_throttles(self):
-        return get_role_throttle(self.request.user)